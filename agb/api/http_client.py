@@ -5,12 +5,14 @@ Provides HTTP communication functionality with AGB API
 """
 
 import asyncio
+import functools
 import json
 import ssl
 from typing import Any, Dict, Optional
 
 import aiohttp
 import requests
+from requests.adapters import HTTPAdapter
 from agb.logger import (
     get_logger,
     log_api_call,
@@ -82,6 +84,39 @@ from .models.delete_session_async_request import DeleteSessionAsyncRequest
 from .models.delete_session_async_response import DeleteSessionAsyncResponse
 
 
+@functools.lru_cache(maxsize=1)
+def _async_ssl_context() -> ssl.SSLContext:
+    """
+    Build the SSL context for aiohttp requests once per process.
+
+    Loading the CA bundle is the most expensive part of an async request's setup,
+    and the context is safe to share between connectors.
+    """
+    # Explicit SSL context (fix certificate verify on macOS/Windows)
+    ssl_ctx = ssl.create_default_context()
+    try:
+        import certifi
+        ssl_ctx.load_verify_locations(certifi.where())
+    except ImportError:
+        pass
+    return ssl_ctx
+
+
+@functools.lru_cache(maxsize=1)
+def _shared_http_adapter() -> HTTPAdapter:
+    """
+    Connection pool shared by every HTTPClient in the process.
+
+    A new HTTPClient is created for each API call, so the pool lives here to let
+    later calls reuse keep-alive connections instead of opening a new TCP and TLS
+    connection every time. The adapter is thread-safe.
+
+    Retries keep the requests default (none), so a failed call such as
+    createSession is reported to the caller and never sent twice.
+    """
+    return HTTPAdapter(pool_connections=32, pool_maxsize=32)
+
+
 class HTTPClient:
     """HTTP client class for communicating with AGB API"""
 
@@ -133,6 +168,11 @@ class HTTPClient:
 
         self.session = requests.Session()
 
+        # Route requests through the process-wide pool so connections outlive this client
+        adapter = _shared_http_adapter()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
         # Add Authorization header
         self.session.headers["authorization"] = self.api_key
 
@@ -761,14 +801,8 @@ class HTTPClient:
         log_api_call(f"{api_name} (async)", request_data_str)
 
         try:
-            # Create aiohttp session with explicit SSL context (fix certificate verify on macOS/Windows)
-            ssl_ctx = ssl.create_default_context()
-            try:
-                import certifi
-                ssl_ctx.load_verify_locations(certifi.where())
-            except ImportError:
-                pass
-            connector = aiohttp.TCPConnector(ssl=ssl_ctx)
+            # Create aiohttp session with the shared SSL context
+            connector = aiohttp.TCPConnector(ssl=_async_ssl_context())
             timeout = aiohttp.ClientTimeout(total=self.timeout)
             async with connector:
                 async with aiohttp.ClientSession(
@@ -1018,8 +1052,11 @@ class HTTPClient:
             return {"success": False, "error": str(e), "status_code": None, "url": url}
 
     def close(self):
-        """Close HTTP session"""
+        """Close HTTP session, keeping the shared connection pool open"""
         if self.session:
+            adapters = getattr(self.session, "adapters", {})
+            for prefix in [p for p, a in adapters.items() if a is _shared_http_adapter()]:
+                del adapters[prefix]
             self.session.close()
 
     # Context related methods
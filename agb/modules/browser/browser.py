@@ -565,6 +565,19 @@ class Browser(BaseService):
         """
         self._stop_browser()
 
+    def reset_for_reinit(self):
+        """
+        Clear the local initialization state so that the next ``initialize`` or
+        ``initialize_async`` call initializes the browser again.
+
+        ``destroy()`` stops the remote browser but keeps this state; call this
+        afterwards to re-initialize on the same session.
+        """
+        self._initialized = False
+        self._option = None
+        self._endpoint_url = None
+        self.endpoint_router_port = None
+
 
     async def screenshot(self, page, full_page: bool = False, **options) -> bytes:
         """
@@ -1404,13 +1404,16 @@ class FileSystem(BaseService):
             path (str): The directory path to monitor for file changes.
             callback (Callable[[List[FileChangeEvent]], None]): Callback function that will be called with a list of FileChangeEvent
                 objects when changes are detected.
-            interval (float): Polling interval in seconds. Defaults to 1.0.
+            interval (float): Polling interval in seconds. Defaults to 1.0. The value is
+                stored on the returned thread's interval attribute and re-read before every
+                poll, so it can be adjusted while monitoring is running.
             stop_event (Optional[threading.Event]): Optional threading.Event to stop the monitoring. If not provided,
                 a new Event will be created and returned via the thread object. Defaults to None.
 
         Returns:
             threading.Thread: The monitoring thread. Call thread.start() to begin monitoring.
-                Use the thread's stop_event attribute to stop monitoring.
+                Use the thread's stop_event attribute to stop monitoring and its interval
+                attribute to change the polling interval.
         """
 
         def _monitor_directory():
@@ -1440,11 +1443,11 @@ class FileSystem(BaseService):
                         logger.error(f"Error monitoring directory: {result.error_message}")
 
                     # Wait for the next poll
-                    stop_event.wait(interval)
+                    stop_event.wait(getattr(monitor_thread, "interval", interval))
 
                 except Exception as e:
                     logger.error(f"Unexpected error in directory monitoring: {e}")
-                    stop_event.wait(interval)
+                    stop_event.wait(getattr(monitor_thread, "interval", interval))
 
             logger.info(f"Stopped monitoring directory: {path}")
 
@@ -1461,4 +1464,5 @@ class FileSystem(BaseService):
 
         # Add stop_event as an attribute to the thread for easy access
         setattr(monitor_thread, "stop_event", stop_event)
+        setattr(monitor_thread, "interval", interval)
         return monitor_thread
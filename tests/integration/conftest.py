@@ -5,15 +5,142 @@ This directory contains helper modules that are not test files. If CI runs pytes
 with globs (e.g. `pytest tests/integration/*.py`), pytest may try to import these
 helpers and they might show up in custom summaries. Explicitly ignore them here.
 
+The session-scoped fixtures below are created once per pytest process. Under
+pytest-xdist every worker is its own process, so each worker gets its own AGB
+client and sessions and the test files run in parallel:
+
+    pytest -n 3 tests/integration/
+
 Note: This file should NOT be run directly as a test. It is a pytest configuration file.
 """
 
+import os
+import time
+
+import pytest
+import pytest_asyncio
+from dotenv import load_dotenv
+from playwright.async_api import async_playwright
+
+from agb import AGB
+from agb.session_params import CreateSessionParams
+
 # Prevent pytest from collecting/importing helper modules as tests.
 collect_ignore = [
     "functional_helpers.py",
     "conftest.py",  # Explicitly ignore conftest.py itself
 ]
 
+# conftest.py is imported before any test module, so loading .env here makes
+# AGB_API_KEY visible to every test. It is read once and cached.
+load_dotenv()
+API_KEY = os.environ.get("AGB_API_KEY")
+
+
+def require_api_key() -> str:
+    """Return the cached API key, skipping the calling test when it is not set."""
+    if not API_KEY:
+        pytest.skip("AGB_API_KEY environment variable not set")
+    return API_KEY
+
+
+@pytest.fixture(scope="session")
+def xdist_worker() -> str:
+    """
+    Name of the pytest-xdist worker running this process ("gw0", "gw1", ...), or
+    "master" without xdist. Use it to keep remote resource names unique per worker.
+    """
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+@pytest.fixture(scope="session")
+def api_key() -> str:
+    """The AGB API key; tests depending on it are skipped when it is not set."""
+    return require_api_key()
+
+
+@pytest.fixture(scope="session")
+def agb_client(api_key: str) -> AGB:
+    """
+    Create one AGB client for the whole run so control-plane calls share its
+    connection pool. Modules may still override this with their own fixture.
+    """
+    return AGB(api_key=api_key)
+
+
+@pytest.fixture(scope="session")
+def shared_session_for(agb_client):
+    """
+    Return a function that gives the run-wide session for an image id.
+
+    The session is created on first use and cached, so every module that only
+    needs a plain session of that image shares one. All of them are deleted at
+    the end of the run.
+    """
+    sessions = {}
+
+    def get(image_id: str):
+        if image_id not in sessions:
+            result = agb_client.create(CreateSessionParams(image_id=image_id))
+            if not result.success or not result.session:
+                pytest.fail(f"Failed to create {image_id} session: {result.error_message}")
+            sessions[image_id] = result.session
+            print(f"✅ Shared {image_id} session created: {result.session.session_id}")
+        return sessions[image_id]
+
+    yield get
+
+    for image_id, session in sessions.items():
+        delete_result = agb_client.delete(session)
+        if not delete_result.success:
+            print(f"❌ Shared {image_id} session deletion failed: {delete_result.error_message}")
+
+
+@pytest.fixture(scope="session")
+def shared_session(shared_session_for):
+    """The run-wide agb-code-space-2 session for every test that only needs a code space."""
+    return shared_session_for("agb-code-space-2")
+
+
+@pytest.fixture(scope="session")
+def agb_browser_session(agb_client, xdist_worker):
+    """
+    Create one browser-image session shared by the browser initialization tests.
+
+    Yields an ``(agb, session)`` tuple and deletes the session at the end of the run.
+    """
+    agb = agb_client
+    create_start_time = time.time()
+    result = agb.create(CreateSessionParams(image_id="agb-browser-use-1"))
+    print(f"⏱️  Session creation took: {time.time() - create_start_time:.3f} seconds")
+    if not result.success or not result.session:
+        pytest.fail(f"Session creation failed: {result.error_message}")
+
+    session = result.session
+    print(
+        f"✅ Session created successfully! Session ID: {session.session_id} "
+        f"(worker: {xdist_worker})"
+    )
+    yield agb, session
+
+    delete_result = agb.delete(session)
+    if delete_result.success:
+        print("✅ Session deleted successfully!")
+    else:
+        print(f"❌ Session deletion failed: {delete_result.error_message}")
+
+
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def playwright_driver():
+    """
+    Start the Playwright driver once for the whole run.
+
+    Tests connect over CDP with it and close only their own browser connection.
+    """
+    async with async_playwright() as p:
+        yield p
+
+
 # If this file is run directly, exit gracefully
 if __name__ == "__main__":
     import sys
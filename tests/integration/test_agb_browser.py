@@ -457,10 +457,8 @@ async def test_browser_async_initialization(session):
             logger.info("Browser is already initialized, destroying it first to test full async initialization...")
             try:
                 browser.destroy()
-                # Reset initialization state manually since destroy() doesn't reset it
-                browser._initialized = False
-                browser._option = None
-                browser.endpoint_router_port = None
+                # destroy() doesn't reset the local initialization state
+                browser.reset_for_reinit()
                 logger.info("Browser destroyed, ready for async initialization")
             except Exception as e:
                 logger.warning(f"Failed to destroy browser: {e}")
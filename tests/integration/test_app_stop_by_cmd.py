@@ -16,6 +16,19 @@ import unittest
 from agb import AGB
 from agb.session_params import CreateSessionParams
 
+_UBUNTU_PARAMS = CreateSessionParams(image_id="agb-computer-use-ubuntu-2204")
+
+
+def _wait_until_ready(session, attempts: int = 8, initial_delay: float = 0.05) -> bool:
+    """Probe the session with a no-op command, backing off exponentially until it answers."""
+    delay = initial_delay
+    for _ in range(attempts):
+        if session.command.execute("true", timeout_ms=2000).success:
+            return True
+        time.sleep(delay)
+        delay *= 2
+    return False
+
 
 class TestAppStopByCmdFlow(unittest.TestCase):
     """Test start app -> get PID -> stop_by_cmd(kill -9) flow."""
@@ -27,8 +40,7 @@ class TestAppStopByCmdFlow(unittest.TestCase):
             self.skipTest("AGB_API_KEY environment variable not set")
 
         self.agb_client = AGB(api_key=api_key)
-        session_params = CreateSessionParams(image_id="agb-computer-use-ubuntu-2204")
-        session_result = self.agb_client.create(session_params)
+        session_result = self.agb_client.create(_UBUNTU_PARAMS)
 
         if not session_result.success or not session_result.session:
             self.fail(
@@ -37,14 +49,14 @@ class TestAppStopByCmdFlow(unittest.TestCase):
 
         self.session = session_result.session
         print(f"Created session: {self.session.session_id}")
-        time.sleep(3)
+        if not _wait_until_ready(self.session):
+            print("Warning: session did not answer readiness probe, continuing anyway")
 
     def tearDown(self):
         """Release session."""
         if hasattr(self, "session") and self.session:
             try:
                 self.session.delete()
-                time.sleep(2)
             except Exception as e:
                 print(f"Error deleting session: {e}")
 
@@ -58,9 +70,18 @@ class TestAppStopByCmdFlow(unittest.TestCase):
         self.assertIsNotNone(apps_result.data, "list_installed returned no apps")
         self.assertGreater(len(apps_result.data), 0, "list_installed returned empty list")
 
-        first_app = apps_result.data[3]
-        start_cmd = getattr(first_app, "start_cmd", None)
-        self.assertIsNotNone(start_cmd, "First app has no start_cmd")
+        # Pick the first startable app, skipping office suites that are slow to launch
+        first_app = next(
+            (
+                app
+                for app in apps_result.data
+                if getattr(app, "start_cmd", None)
+                and "office" not in (getattr(app, "name", "") or "").lower()
+            ),
+            None,
+        )
+        self.assertIsNotNone(first_app, "list_installed returned no suitable app")
+        start_cmd = first_app.start_cmd
         app_name = getattr(first_app, "name", "Unknown")
 
         # Start the application
@@ -1,6 +1,6 @@
 #!/usr/bin/env python3
 """
-Integration test: create session with browser image, initialize browser async,
+Integration test: initialize the browser async on the shared browser session,
 connect via Playwright CDP, open a page and print title, then cleanup.
 
 Run directly:
@@ -10,54 +10,32 @@ Or with pytest (requires AGB_API_KEY in env or .env):
     pytest tests/integration/test_browser_playwright_connect.py -v -s
 """
 
-import asyncio
-import os
-import sys
+import pytest
 
-from dotenv import load_dotenv
-from playwright.async_api import async_playwright
-
-from agb import AGB
 from agb.modules.browser import BrowserOption
-from agb.session_params import CreateSessionParams
-
-load_dotenv()
 
 
-async def main() -> None:
-    agb = AGB()
-    create_result = agb.create(CreateSessionParams(image_id="agb-browser-use-1"))
-    if not create_result.success:
-        raise SystemExit(f"Session creation failed: {create_result.error_message}")
+async def _connect_and_open_page(session, playwright) -> None:
+    # Reuses the browser if an earlier test on the shared session initialized it
+    ok = await session.browser.initialize_async(BrowserOption())
+    assert ok, "Browser initialization failed"
 
-    session = create_result.session
+    endpoint_url = session.browser.get_endpoint_url()
+    browser = await playwright.chromium.connect_over_cdp(endpoint_url)
     try:
-        ok = await session.browser.initialize_async(BrowserOption())
-        if not ok:
-            raise SystemExit("Browser initialization failed")
-
-        endpoint_url = session.browser.get_endpoint_url()
-        async with async_playwright() as p:
-            browser = await p.chromium.connect_over_cdp(endpoint_url)
-            page = await browser.new_page()
-            await page.goto("https://agb.cloud")
-            print("Title:", await page.title())
-            await browser.close()
+        page = await browser.new_page()
+        await page.goto("https://agb.cloud")
+        print("Title:", await page.title())
     finally:
-        agb.delete(session)
+        await browser.close()
 
 
-def test_browser_playwright_connect():
+@pytest.mark.asyncio(loop_scope="session")
+async def test_browser_playwright_connect(agb_browser_session, playwright_driver):
     """Run the browser + Playwright CDP connect flow (integration test)."""
-    if not os.environ.get("AGB_API_KEY"):
-        raise SystemExit(
-            "AGB_API_KEY not set. Set it in env or .env to run this test."
-        )
-    asyncio.run(main())
+    _, session = agb_browser_session
+    await _connect_and_open_page(session, playwright_driver)
 
 
 if __name__ == "__main__":
-    if not os.environ.get("AGB_API_KEY"):
-        print("AGB_API_KEY not set. Set it in env or .env to run this test.")
-        sys.exit(1)
-    asyncio.run(main())
+    raise SystemExit(pytest.main([__file__, "-v", "-s"]))
@@ -1,45 +1,155 @@
+import asyncio
 import os
+import socket
 import time
 import unittest
 import httpx
-import sys
-
-from agb import AGB
-
-
-class TestContextFileUrlsIntegration(unittest.TestCase):
-    @classmethod
-    def setUpClass(cls):
-        api_key = os.environ.get("AGB_API_KEY")
-        if not api_key:
-            raise AssertionError("Integration test failed: No API key available")
-        cls.agb = AGB(api_key)
-
-        # Create a test context
-        cls.context_name = f"test-file-url-py-{int(time.time())}"
-        context_result = cls.agb.context.create(cls.context_name)
-        if not context_result.success or not context_result.context:
-            raise AssertionError("Failed to create context for file URL test")
-        cls.context = context_result.context
-        print(f"Created context: {cls.context.name} (ID: {cls.context.id})")
-
-    @classmethod
-    def tearDownClass(cls):
-        # Clean up created context
-        if hasattr(cls, "context"):
-            try:
-                cls.agb.context.delete(cls.context)
-                print(f"Deleted context: {cls.context.name} (ID: {cls.context.id})")
-            except Exception as e:
-                print(f"Warning: Failed to delete context {cls.context.name}: {e}")
-
-    def test_get_file_upload_url(self):
+import pytest
+
+# Status codes OSS returns for a successful presigned PUT
+_UPLOAD_OK_STATUSES = frozenset({200, 204})
+
+
+async def poll(check, max_total=60.0, initial=0.2, cap=2.0, settled=None):
+    """
+    Call ``check`` until the first element of its result is truthy or ``max_total``
+    seconds have elapsed, sleeping with capped exponential backoff in between.
+    If ``settled`` is given, polling also stops as soon as it returns True.
+
+    ``check`` is synchronous and runs in a worker thread; the waits use
+    ``asyncio.sleep`` so other coroutines keep running while polling.
+
+    Returns the last result of ``check`` and the number of retries.
+    """
+    start = time.monotonic()
+    attempt = 0
+    while True:
+        result = await asyncio.to_thread(check)
+        if result[0] or time.monotonic() - start >= max_total:
+            return result, attempt
+        if settled is not None and settled():
+            return result, attempt
+        await asyncio.sleep(min(cap, initial * 2 ** attempt))
+        attempt += 1
+
+
+class _ListingProbe:
+    """
+    Check whether a file is listed under a context directory.
+
+    Calling the probe returns ``(found, list_result, parent)``. ``settled`` becomes
+    True once successful listings have stayed empty for ``settle_after`` seconds.
+    A fresh upload can take a moment to be listed, so a short run of empty
+    listings is not enough to give up on it.
+    """
+
+    def __init__(self, agb, context_id, parent, file_path, settle_after=10.0):
+        self._agb = agb
+        self._context_id = context_id
+        self._parent = parent
+        self._file_path = file_path
+        self._file_name = os.path.basename(file_path)
+        self._settle_after = settle_after
+        self._empty_since = None
+        self.settled = False
+
+    def __call__(self):
+        res = self._agb.context.list_files(
+            self._context_id, self._parent, page_number=1, page_size=50
+        )
+        if not res or not res.success:
+            self._empty_since = None
+            return False, res, self._parent
+        found = any(
+            (getattr(e, "file_path", "") == self._file_path)
+            or (getattr(e, "file_name", "") == self._file_name)
+            for e in res.entries
+        )
+        if found or res.entries:
+            self._empty_since = None
+        elif self._empty_since is None:
+            self._empty_since = time.monotonic()
+        self.settled = (
+            self._empty_since is not None
+            and time.monotonic() - self._empty_since >= self._settle_after
+        )
+        return found, res, self._parent
+
+
+@pytest.fixture(scope="class")
+def file_url_context(request, agb_client, xdist_worker):
+    """Create a test context for the class and delete it afterwards."""
+    cls = request.cls
+    cls.agb = agb_client
+
+    # Create a test context; the worker name keeps parallel runs apart
+    cls.context_name = f"test-file-url-py-{xdist_worker}-{int(time.time())}"
+    context_result = cls.agb.context.create(cls.context_name)
+    if not context_result.success or not context_result.context:
+        raise AssertionError("Failed to create context for file URL test")
+    cls.context = context_result.context
+    print(f"Created context: {cls.context.name} (ID: {cls.context.id})")
+
+    yield
+
+    # Clean up created context
+    try:
+        cls.agb.context.delete(cls.context)
+        print(f"Deleted context: {cls.context.name} (ID: {cls.context.id})")
+    except Exception as e:
+        print(f"Warning: Failed to delete context {cls.context.name}: {e}")
+
+
+@pytest.mark.usefixtures("file_url_context")
+class TestContextFileUrlsIntegration(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        # One async client for every OSS request so connections are kept alive and
+        # reused, and concurrent requests can share an HTTP/2 connection.
+        # TCP_NODELAY keeps small request bodies from waiting on Nagle + delayed ACK.
+        # The transport owns the connection settings, so they are configured there.
+        transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
+            http2=True,
+            verify=True,
+            socket_options=[(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)],
+        )
+        self.http = httpx.AsyncClient(timeout=30.0, transport=transport)
+
+    async def asyncTearDown(self):
+        try:
+            await self.http.aclose()
+        except Exception as e:
+            print(f"Warning: Failed to close HTTP client: {e}")
+
+    async def _oss_request(self, method, url, action, required=True, **kwargs):
+        """
+        Send a request to OSS on the shared client.
+
+        Transport errors fail the test when ``required`` is set; otherwise they are
+        only logged and None is returned.
+        """
+        try:
+            return await self.http.request(method, url, **kwargs)
+        except httpx.ConnectError as e:
+            print(f"⚠️ {action} failed due to network connection error: {e}")
+            if required:
+                print(f"This is likely a system-level network issue, failing {action.lower()} test")
+                self.fail(f"Network connection error during {action.lower()}: {e}")
+        except Exception as e:
+            print(f"⚠️ {action} failed with unexpected error: {e}")
+            if required:
+                self.fail(f"Unexpected error during {action.lower()}: {e}")
+        return None
+
+    async def test_get_file_upload_url(self):
         """
         Create a context and request a presigned upload URL for a test path.
         Validate that a URL is returned.
         """
         test_path = "/tmp/integration_upload_test.txt"
-        result = self.agb.context.get_file_upload_url(self.context.id, test_path)
+        result = await asyncio.to_thread(
+            self.agb.context.get_file_upload_url, self.context.id, test_path
+        )
 
         self.assertTrue(result.request_id is not None and isinstance(result.request_id, str))
 
@@ -58,82 +168,45 @@ class TestContextFileUrlsIntegration(unittest.TestCase):
 
         # Use the obtained presigned URL to upload content to OSS
         upload_content = f"AGB integration upload test at {int(time.time())}\n".encode("utf-8")
-        try:
-            # Use more robust httpx configuration
-            with httpx.Client(
-                timeout=30.0,
-                limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
-                http2=True,
-                verify=True
-            ) as client:
-                response = client.put(result.url, content=upload_content)
-                self.assertIn(
-                    response.status_code,
-                    (200, 204),
-                    f"Upload failed with status code {response.status_code}"
-                )
-                etag = response.headers.get("ETag")
-                print(f"Uploaded {len(upload_content)} bytes, status={response.status_code}, ETag={etag}")
-        except httpx.ConnectError as e:
-            print(f"⚠️ Upload failed due to network connection error: {e}")
-            print("This is likely a system-level network issue, failing upload test")
-            self.fail(f"Network connection error during upload: {e}")
-        except Exception as e:
-            print(f"⚠️ Upload failed with unexpected error: {e}")
-            self.fail(f"Unexpected error during upload: {e}")
+        # Presigning the download URL does not depend on the upload, so request it
+        # from the control plane while the PUT is in flight
+        response, dl_result = await asyncio.gather(
+            self._oss_request("PUT", result.url, "Upload", content=upload_content),
+            asyncio.to_thread(
+                self.agb.context.get_file_download_url, self.context.id, test_path
+            ),
+        )
+        self.assertIn(
+            response.status_code,
+            _UPLOAD_OK_STATUSES,
+            f"Upload failed with status code {response.status_code}"
+        )
+        etag = response.headers.get("ETag")
+        print(
+            f"Uploaded {len(upload_content)} bytes, status={response.status_code}, "
+            f"ETag={etag}, protocol={response.http_version}"
+        )
 
-        # Fetch a presigned download URL for the same file and verify content
-        dl_result = self.agb.context.get_file_download_url(self.context.id, test_path)
+        # Verify the presigned download URL for the same file, then the content
         self.assertTrue(dl_result.success, "get_file_download_url should be successful")
         self.assertTrue(isinstance(dl_result.url, str) and len(dl_result.url) > 0, "Download URL should be non-empty")
         print(f"Download URL: {dl_result.url[:80]}... (RequestID: {dl_result.request_id})")
 
-        try:
-            # Use more robust httpx configuration
-            with httpx.Client(
-                timeout=30.0,
-                limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
-                http2=True,
-                verify=True
-            ) as client:
-                dl_resp = client.get(dl_result.url)
-                self.assertEqual(dl_resp.status_code, 200, f"Download failed with status code {dl_resp.status_code}")
-                self.assertEqual(dl_resp.content, upload_content, "Downloaded content does not match uploaded content")
-                print(f"Downloaded {len(dl_resp.content)} bytes, content matches uploaded data")
-        except httpx.ConnectError as e:
-            print(f"⚠️ Download failed due to network connection error: {e}")
-            print("This is likely a system-level network issue, failing download test")
-            self.fail(f"Network connection error during download: {e}")
-        except Exception as e:
-            print(f"⚠️ Download failed with unexpected error: {e}")
-            self.fail(f"Unexpected error during download: {e}")
-
-        # List files to verify presence of the uploaded file under /tmp (with small retry)
+        # List files to verify presence of the uploaded file under /tmp (with small retry),
+        # overlapping the polling with the download of the uploaded content
         file_name = os.path.basename(test_path)
 
-        def list_contains():
-            res = self.agb.context.list_files(self.context.id, "/tmp", page_number=1, page_size=50)
-            if not res or not res.success:
-                return False, res, "/tmp"
-            found_local = any(
-                (getattr(e, "file_path", "") == test_path)
-                or (getattr(e, "file_name", "") == file_name)
-                for e in res.entries
-            )
-            if found_local or len(res.entries) > 0:
-                return found_local, res, "/tmp"
-            return False, res, "/tmp"
-
-        found = False
-        last_lf_res = None
-        chosen_parent = None
-        retries_presence = 0
-        for _ in range(30):
-            found, last_lf_res, chosen_parent = list_contains()
-            if found:
-                break
-            retries_presence += 1
-            time.sleep(2.0)
+        list_contains = _ListingProbe(self.agb, self.context.id, "/tmp", test_path)
+
+        dl_resp, presence = await asyncio.gather(
+            self._oss_request("GET", dl_result.url, "Download"),
+            poll(list_contains, 60.0, settled=lambda: list_contains.settled),
+        )
+        self.assertEqual(dl_resp.status_code, 200, f"Download failed with status code {dl_resp.status_code}")
+        self.assertEqual(dl_resp.content, upload_content, "Downloaded content does not match uploaded content")
+        print(f"Downloaded {len(dl_resp.content)} bytes, content matches uploaded data")
+
+        (found, last_lf_res, chosen_parent), retries_presence = presence
         print(f"List files retry attempts (presence check): {retries_presence}")
 
         if last_lf_res and chosen_parent:
@@ -142,60 +215,47 @@ class TestContextFileUrlsIntegration(unittest.TestCase):
         else:
             print("List files: no listing result available")
 
-        # Only assert presence if listing returned entries; otherwise skip presence assert due to backend limitations
-        if last_lf_res and len(last_lf_res.entries) > 0:
-            self.assertTrue(found, "Uploaded file should appear in list_files")
+        self.assertTrue(found, f"Uploaded file should appear in list_files under {chosen_parent}")
 
         # Delete the file and verify it disappears from listing (with small retry)
-        op = self.agb.context.delete_file(self.context.id, test_path)
+        op = await asyncio.to_thread(self.agb.context.delete_file, self.context.id, test_path)
         self.assertTrue(op.success, "delete_file should be successful")
         print(f"Deleted file: {test_path}")
 
-        removed = False
-        retries_deletion = 0
-        for _ in range(20):
-            present, _, _ = list_contains()
-            if last_lf_res and len(last_lf_res.entries) > 0:
-                if not present:
-                    removed = True
-                    break
-                removed = False
-            else:
-                removed = True
-                break
-            retries_deletion += 1
-            time.sleep(1.0)
-        print(f"List files retry attempts (deletion check): {retries_deletion}")
-        self.assertTrue(removed, "Deleted file should not appear in list_files when listing is available")
-        if last_lf_res:
-            prev = (last_lf_res.count if getattr(last_lf_res, "count", None) is not None else len(last_lf_res.entries))
-            print(f"List files: {file_name} absent after delete (listing availability: {prev})")
-
-        # Additionally, attempt to download after delete and log the status.
-        # Some backends may keep presigned URLs valid until expiry even if the file is deleted.
-        post_dl = self.agb.context.get_file_download_url(self.context.id, test_path)
-        if post_dl.success and isinstance(post_dl.url, str) and len(post_dl.url) > 0:
-            try:
-                # Use more robust httpx configuration
-                with httpx.Client(
-                    timeout=30.0,
-                    limits=httpx.Limits(max_keepalive_connections=5, max_connections=10),
-                    http2=True,
-                    verify=True
-                ) as client:
-                    post_resp = client.get(post_dl.url)
+        def deletion_confirmed():
+            # A failed listing observes nothing, so it does not confirm the removal
+            present, res, _ = list_contains()
+            return (bool(res and res.success) and not present,)
+
+        async def post_delete_probe():
+            # Attempt to download after delete and log the status.
+            # Some backends may keep presigned URLs valid until expiry even if the file is deleted.
+            post_dl = await asyncio.to_thread(
+                self.agb.context.get_file_download_url, self.context.id, test_path
+            )
+            if post_dl.success and isinstance(post_dl.url, str) and len(post_dl.url) > 0:
+                post_resp = await self._oss_request(
+                    "GET", post_dl.url, "Post-delete download", required=False
+                )
+                if post_resp is not None:
                     print(f"Post-delete download status (informational): {post_resp.status_code}")
-            except httpx.ConnectError as e:
-                print(f"⚠️ Post-delete download failed due to network error: {e}")
-            except Exception as e:
-                print(f"⚠️ Post-delete download failed with unexpected error: {e}")
+            else:
+                print("Post-delete: download URL not available, treated as deleted")
+
+        # The informational probe costs two extra RPCs and asserts nothing, so it
+        # only runs on request; when it does, overlap it with the listing poll
+        if os.environ.get("AGB_TEST_POST_DELETE_PROBE") == "1":
+            ((removed,), retries_deletion), _ = await asyncio.gather(
+                poll(deletion_confirmed, 20.0),
+                post_delete_probe(),
+            )
         else:
-            print("Post-delete: download URL not available, treated as deleted")
+            print("Post-delete: probe skipped (set AGB_TEST_POST_DELETE_PROBE=1 to enable)")
+            (removed,), retries_deletion = await poll(deletion_confirmed, 20.0)
+        print(f"List files retry attempts (deletion check): {retries_deletion}")
+        self.assertTrue(removed, "Deleted file should not appear in list_files")
+        print(f"List files: {file_name} absent after delete")
 
 
 if __name__ == "__main__":
-    result = unittest.main(exit=False)
-    if result.result.wasSuccessful():
-        sys.exit(0)
-    else:
-        sys.exit(1)
+    raise SystemExit(pytest.main([__file__, "-v", "-s"]))
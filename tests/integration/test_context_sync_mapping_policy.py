@@ -8,6 +8,7 @@ import os
 import time
 import unittest
 import asyncio
+from concurrent.futures import ThreadPoolExecutor
 
 from agb import AGB
 from agb.context_sync import (
@@ -21,6 +22,42 @@ from agb.context_sync import (
 )
 from agb.session_params import CreateSessionParams
 
+
+def wait_until(predicate, timeout, initial=0.5, factor=2.0, cap=5.0):
+    """
+    Call ``predicate`` until it returns True or ``timeout`` seconds have passed.
+
+    Sleeps between calls with exponential backoff starting at ``initial`` and
+    capped at ``cap``. Returns whether the predicate was satisfied.
+    """
+    deadline = time.monotonic() + timeout
+    delay = initial
+    while True:
+        if predicate():
+            return True
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        time.sleep(min(delay, remaining))
+        delay = min(delay * factor, cap)
+
+
+def _sync_done(session, context_id):
+    """Whether every upload/download task of ``context_id`` in ``session`` has finished."""
+    tasks = [
+        d
+        for d in session.context.info().context_status_data or []
+        if d.context_id == context_id and d.task_type in ("upload", "download")
+    ]
+    return all(d.status in ("Success", "Failed") for d in tasks)
+
+
+def _session_released(agb, session_id, labels):
+    """Whether ``session_id`` no longer shows up among the sessions with ``labels``."""
+    result = agb.list(labels=labels)
+    return result.success and session_id not in result.session_ids
+
+
 class TestContextSyncWithMappingPolicyIntegration(unittest.TestCase):
     """Test cross-platform context synchronization with MappingPolicy."""
 
@@ -52,6 +89,10 @@ class TestContextSyncWithMappingPolicyIntegration(unittest.TestCase):
         print(f"✅ Created context: {context.name} (ID: {context.id})")
         print(f"📊 Context creation request ID: {context_result.request_id}")
 
+        # Teardown deletes run here so the session and context deletes overlap
+        executor = ThreadPoolExecutor(max_workers=2)
+        code_session_delete = None
+
         try:
             # Define paths
             browser_path = "/tmp/mapping"
@@ -79,9 +120,6 @@ class TestContextSyncWithMappingPolicyIntegration(unittest.TestCase):
             )
 
             # Create Browser session
-            # Wait 10s before creating session to ensure resource availability
-            print("Waiting 10s before creating Browser session...")
-            time.sleep(10)
             browser_session_result = self.ab.create(browser_session_params)
             self.assertTrue(browser_session_result.success, f"Failed to create Browser session: {browser_session_result.error_message}")
             self.assertIsNotNone(browser_session_result.session, "Browser session object is None")
@@ -91,19 +129,17 @@ class TestContextSyncWithMappingPolicyIntegration(unittest.TestCase):
 
             # Wait for Browser session to be ready
             print("Waiting for Browser session to be ready...")
-            time.sleep(15)
+            self.assertTrue(
+                wait_until(lambda: browser_session.info().success, timeout=15),
+                "Browser session did not become ready",
+            )
 
             # Create test file in Browser session
             test_file_path = f"{browser_path}/{test_file_name}"
             print(f"Creating test file in Browser: {test_file_path}")
-            create_file_cmd = f'echo {test_content} > "{test_file_path}"'
-            browser_cmd_result = browser_session.command.execute(create_file_cmd)
-            self.assertIsNotNone(browser_cmd_result)
-            print(f"Browser file creation result: {browser_cmd_result.output}")
-
-            # Verify file exists in Browser session
-            verify_file_cmd = f'cat "{test_file_path}"'
-            verify_result = browser_session.command.execute(verify_file_cmd)
+            # Write and read back in one round-trip; the output is the file content
+            create_file_cmd = f'echo {test_content} > "{test_file_path}" && cat "{test_file_path}"'
+            verify_result = browser_session.command.execute(create_file_cmd)
             self.assertIsNotNone(verify_result)
             print(f"Browser file content: {verify_result.output}")
             self.assertIn(test_content, verify_result.output, "File should contain test content in browser")
@@ -116,16 +152,21 @@ class TestContextSyncWithMappingPolicyIntegration(unittest.TestCase):
 
             # Wait for upload to complete
             print("Waiting for upload to complete...")
-            time.sleep(10)
+            wait_until(lambda: _sync_done(browser_session, context.id), timeout=10)
 
             # Delete Browser session
             print("Deleting Browser session...")
             browser_delete_result = self.ab.delete(browser_session)
             print(f"Browser session deleted: {browser_session.session_id} (RequestID: {browser_delete_result.request_id})")
 
-            # Wait for resource release
-            print("Waiting 10s for Browser session resource release...")
-            time.sleep(10)
+            # Wait for resource release before creating the next session
+            print("Waiting for Browser session resource release...")
+            wait_until(
+                lambda: _session_released(
+                    self.ab, browser_session.session_id, {"test": "mapping-policy-Browser"}
+                ),
+                timeout=20,
+            )
 
             # ========== Phase 2: Create Code session with MappingPolicy and verify data ==========
             print("========== Phase 2: Code Session - Access Data via MappingPolicy ==========")
@@ -151,9 +192,6 @@ class TestContextSyncWithMappingPolicyIntegration(unittest.TestCase):
             )
 
             # Create Code session
-            # Wait 10s before creating session to ensure resource availability
-            print("Waiting 10s before creating Code session...")
-            time.sleep(10)
             code_session_result = self.ab.create(code_session_params)
             self.assertTrue(code_session_result.success, f"Failed to create Code session: {code_session_result.error_message}")
             self.assertIsNotNone(code_session_result.session, "Code session object is None")
@@ -162,32 +200,36 @@ class TestContextSyncWithMappingPolicyIntegration(unittest.TestCase):
             print(f"Created Code session: {code_session.session_id} with mapping from {browser_path} to {code_path}")
 
             try:
+                # Verify file exists in Code session at the mapped path
+                code_test_file_path = f"{code_path}/{test_file_name}"
+                # Existence marker and content in one round-trip
+                check_file_cmd = (
+                    f'if test -f "{code_test_file_path}"; then echo "FILE_EXISTS" && cat "{code_test_file_path}"; '
+                    f'else echo "FILE_NOT_FOUND"; fi'
+                )
+
                 # Wait for Code session to be ready and data to be downloaded
                 print("Waiting for Code session to be ready and data to be downloaded...")
-                time.sleep(15)
+                check_result = None
 
-                # Verify file exists in Code session at the mapped path
-                code_test_file_path = f"{code_path}/{test_file_name}"
-                print(f"Verifying file exists in Code at: {code_test_file_path}")
+                def _file_downloaded():
+                    nonlocal check_result
+                    check_result = code_session.command.execute(check_file_cmd)
+                    return "FILE_EXISTS" in (check_result.output or "")
+
+                wait_until(_file_downloaded, timeout=15)
 
                 # Check if file exists
-                check_file_cmd = f'test -f "{code_test_file_path}" && echo "FILE_EXISTS" || echo "FILE_NOT_FOUND"'
-                check_result = code_session.command.execute(check_file_cmd)
+                print(f"Verifying file exists in Code at: {code_test_file_path}")
                 self.assertIsNotNone(check_result)
                 print(f"Code file check result: {check_result.output}")
 
                 # Verify file exists
                 self.assertIn("FILE_EXISTS", check_result.output, "File should exist in Code session at mapped path")
 
-                # Read file content in Code session
-                read_file_cmd = f'cat "{code_test_file_path}"'
-                read_result = code_session.command.execute(read_file_cmd)
-                self.assertIsNotNone(read_result)
-                print(f"Code file content: {read_result.output}")
-
-                # Verify file content matches
+                # Verify file content matches; it follows the marker in the same output
                 self.assertTrue(
-                    test_content in read_result.output or test_content.strip() in read_result.output,
+                    test_content in check_result.output or test_content.strip() in check_result.output,
                     "File content in Code should match the content created in Browser"
                 )
 
@@ -213,17 +255,38 @@ class TestContextSyncWithMappingPolicyIntegration(unittest.TestCase):
                 print("✓ Data created in Browser session was successfully accessed in Code session via MappingPolicy")
 
             finally:
-                # Ensure Code session is deleted
-                delete_result = self.ab.delete(code_session)
-                print(f"Code session deleted: {code_session.session_id} (RequestID: {delete_result.request_id})")
-                # Wait for resource release
-                print("Waiting 10s for Code session resource release...")
-                time.sleep(10)
+                # Ensure Code session is deleted; no session is created afterwards,
+                # so there is no resource release to wait for
+                code_session_delete = executor.submit(self.ab.delete, code_session)
 
         finally:
-            # Ensure context is deleted
-            delete_context_result = self.ab.context.delete(context)
-            print(f"Context deleted: {context.id} (RequestID: {delete_context_result.request_id})")
+            # Ensure context is deleted, concurrently with the Code session delete
+            context_delete = executor.submit(self.ab.context.delete, context)
+            try:
+                delete_result = None
+                if code_session_delete is not None:
+                    delete_result = code_session_delete.result(timeout=30)
+                    print(
+                        f"Code session delete: {code_session.session_id} "
+                        f"(success: {delete_result.success}, RequestID: {delete_result.request_id})"
+                    )
+                delete_context_result = context_delete.result(timeout=30)
+                print(
+                    f"Context delete: {context.id} "
+                    f"(success: {delete_context_result.success}, RequestID: {delete_context_result.request_id})"
+                )
+            finally:
+                executor.shutdown()
+            # Check both results before failing on either, so neither goes unreported
+            if delete_result is not None:
+                self.assertTrue(
+                    delete_result.success,
+                    f"Failed to delete Code session: {delete_result.error_message}",
+                )
+            self.assertTrue(
+                delete_context_result.success,
+                f"Failed to delete context: {delete_context_result.error_message}",
+            )
 
 if __name__ == "__main__":
     unittest.main()
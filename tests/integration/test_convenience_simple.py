@@ -4,49 +4,26 @@
 Test for AGB create and delete interfaces
 """
 
-import os
 import sys
 import traceback
 import pytest
 
-# Add project root directory to Python path
-project_root = os.path.dirname(
-    os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-)
-sys.path.insert(0, project_root)
-print(f"Added project root to Python path: {project_root}")
-print(f"Current working directory: {os.getcwd()}")
-print(f"Python path: {sys.path[:3]}")  # Show first 3 entries
+from agb import AGB
+from agb.session import Session
+from agb.session_params import CreateSessionParams
 
 
-def get_api_key():
-    """Get API Key from environment variables"""
-    api_key = os.getenv("AGB_API_KEY")
-    if not api_key:
-        pytest.fail(
-            "AGB_API_KEY environment variable not set. Please set the environment variable:\n"
-            "export AGB_API_KEY='your_api_key_here'"
-        )
-    return api_key
-
-
-def test_agb_create_and_delete():
+def test_agb_create_and_delete(agb_client: AGB):
     """Test AGB create and delete interfaces"""
     print("=== Testing AGB Create and Delete Interfaces ===")
 
     try:
-        # Get API Key
-        api_key = get_api_key()
+        api_key = agb_client.api_key
         print(f"Using API Key: {api_key[:10]}...{api_key[-4:]}")
 
-        # Import AGB client
-        from agb import AGB
-        from agb.session_params import CreateSessionParams
-
-        # Initialize AGB client
-        print("\n1. Initializing AGB client...")
-        agb = AGB(api_key=api_key)
-        print("✅ AGB client initialized successfully")
+        # The AGB client is shared by the whole test run (see conftest.py)
+        print("\n1. Using shared AGB client...")
+        agb = agb_client
 
         # Test session creation
         print("\n2. Testing session creation...")
@@ -99,7 +76,6 @@ def test_agb_create_and_delete():
                 try:
                     # Ensure session is not None and is of correct type before deletion
                     if session is not None:
-                        from agb.session import Session  # Ensure correct import
                         if not isinstance(session, Session):
                             session = Session(**session.__dict__)
                         delete_result = agb.delete(session)
@@ -138,22 +114,14 @@ def test_agb_create_and_delete():
         assert False, f"Test failed: {e}"
 
 
-def test_agb_with_custom_params():
+def test_agb_with_custom_params(agb_client: AGB):
     """Test AGB create with custom parameters"""
     print("\n=== Testing AGB Create with Custom Parameters ===")
 
     try:
-        # Get API Key
-        api_key = get_api_key()
-
-        # Import AGB client and session params
-        from agb import AGB
-        from agb.session_params import CreateSessionParams
-
-        # Initialize AGB client
-        print("\n1. Initializing AGB client...")
-        agb = AGB(api_key=api_key)
-        print("✅ AGB client initialized successfully")
+        # The AGB client is shared by the whole test run (see conftest.py)
+        print("\n1. Using shared AGB client...")
+        agb = agb_client
 
         # Create session with custom parameters
         print("\n2. Testing session creation with custom parameters...")
@@ -200,20 +168,5 @@ def test_agb_with_custom_params():
 
 
 if __name__ == "__main__":
-    try:
-        # Run basic create and delete test
-        success1 = test_agb_create_and_delete()
-
-        # Run custom parameters test
-        success2 = test_agb_with_custom_params()
-
-        print("\n=== Test Summary ===")
-        if success1 and success2:
-            print("✅ All tests passed.")
-            sys.exit(0)
-        else:
-            print("❌ Some tests failed.")
-            sys.exit(1)
-    except Exception as e:
-        print(f"\n❌ Tests failed with unexpected exception: {e}")
-        sys.exit(1)
+    # The tests take the shared agb_client fixture, so run them through pytest
+    sys.exit(pytest.main([__file__, "-v", "-s"]))
@@ -4,13 +4,20 @@ FileTransfer integration tests (real sessions + real file transfers).
 Notes:
 - These tests require a real AGB account and network access.
 - The API key is read ONLY from the `AGB_API_KEY` environment variable (do not hardcode secrets).
+- Each test creates and deletes its own session and shares no state, so pytest-xdist
+  can run them at the same time. The default load distribution spreads them over
+  workers; `--dist=loadfile` would keep them on one worker:
+
+      pytest -n 2 tests/integration/test_file_transfer_integration.py
 """
 
 from __future__ import annotations
 
+import hashlib
 import os
-import tempfile
 import time
+from pathlib import Path
+from typing import Optional
 
 import pytest
 
@@ -32,15 +39,45 @@ def _safe_join_dir_file(dir_path: str, file_name: str) -> str:
     return f"{base}/{file_name}" if base else f"/{file_name}"
 
 
-def _sleep_for_session_ready() -> None:
+def _sha256_text_file(path: str, chunk_size: int = 1 << 20) -> bytes:
+    """
+    SHA-256 digest of a local text file, read in chunks so memory use stays constant.
+
+    CRLF and CR line endings are hashed as LF, the same normalization the upload
+    test applies to the content it reads back.
     """
-    Heuristic wait for session initialization (including internal context readiness).
-    Backend can be flaky in integration environments, so use a conservative delay.
+    digest = hashlib.sha256()
+    pending = b""
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            chunk = pending + chunk
+            # A trailing CR may be the first half of a CRLF split across chunks
+            pending = chunk[-1:] if chunk.endswith(b"\r") else b""
+            chunk = chunk[: len(chunk) - len(pending)]
+            digest.update(chunk.replace(b"\r\n", b"\n").replace(b"\r", b"\n"))
+    digest.update(pending.replace(b"\r", b"\n"))
+    return digest.digest()
+
+
+def _wait_session_ready(session, timeout: float = 6.0) -> Optional[str]:
     """
-    time.sleep(6)
+    Wait for session initialization (including internal context readiness).
+
+    Polls the file_transfer context path with exponential backoff and returns it
+    as soon as it is available, or None once ``timeout`` seconds have passed.
+    """
+    start = time.monotonic()
+    attempt = 0
+    while True:
+        context_path = session.file.transfer_path()
+        remaining = timeout - (time.monotonic() - start)
+        if context_path or remaining <= 0:
+            return context_path
+        time.sleep(min(0.2 * 1.5 ** attempt, remaining))
+        attempt += 1
 
 
-def test_file_transfer_upload_integration() -> None:
+def test_file_transfer_upload_integration(tmp_path: Path) -> None:
     """
     Verify the full upload workflow:
     1) Resolve file_transfer context_path
@@ -59,62 +96,37 @@ def test_file_transfer_upload_integration() -> None:
     session = session_result.session
 
     try:
-        _sleep_for_session_ready()
-
-        context_path = session.file.transfer_path()
+        context_path = _wait_session_ready(session)
         if not context_path:
             pytest.fail("Failed to get file_transfer context_path (backend may not return internal context)")
 
         remote_path = _safe_join_dir_file(context_path, "upload_test.txt")
 
-        test_content = ("This is AGB FileTransfer upload integration test content.\n" * 10)
-        with tempfile.NamedTemporaryFile(mode="w", delete=False, suffix=".txt") as f:
-            f.write(test_content)
-            f.flush()
-            local_path = f.name
-
-        try:
-            upload_result = session.file.upload(
-                local_path=local_path,
-                remote_path=remote_path,
-                wait=True,
-                wait_timeout=300.0,
-                poll_interval=2.0,
-            )
-
-            assert upload_result.success, f"Upload failed: {upload_result.error_message}"
-            assert upload_result.bytes_sent > 0
-            assert upload_result.request_id_upload_url
-            assert upload_result.request_id_sync
-
-            # Verify the directory exists
-            ls = session.command.execute(
-                f"ls -la {context_path.rstrip('/')}/",
-                timeout_ms=10_000,
-            )
-            assert ls.success, f"Remote directory does not exist or is not accessible: {ls.error_message}"
-
-            # Verify the file exists
-            list_result = session.file.list(f"{context_path.rstrip('/')}/")
-            assert list_result.success, f"list failed: {list_result.error_message}"
-            assert any(
-                (it.get("name") == "upload_test.txt" and not it.get("isDirectory", False))
-                for it in list_result.entries
-            ), "Uploaded file is not present in directory listing"
-
-            # Verify content matches
-            read_result = session.file.read(remote_path)
-            assert read_result.success, f"read failed: {read_result.error_message}"
-            # Normalize line endings to handle \r\n vs \n differences
-            expected_content = test_content.replace('\r\n', '\n').replace('\r', '\n').strip()
-            actual_content = read_result.content.replace('\r\n', '\n').replace('\r', '\n').strip()
-            assert actual_content == expected_content
-
-        finally:
-            try:
-                os.unlink(local_path)
-            except OSError:
-                pass
+        test_content_bytes = b"This is AGB FileTransfer upload integration test content.\n" * 10
+        # pytest removes tmp_path, so the local file needs no cleanup
+        local_path = str(tmp_path / "upload_test.txt")
+        Path(local_path).write_bytes(test_content_bytes)
+
+        upload_result = session.file.upload(
+            local_path=local_path,
+            remote_path=remote_path,
+            wait=True,
+            wait_timeout=300.0,
+            poll_interval=0.5,
+        )
+
+        assert upload_result.success, f"Upload failed: {upload_result.error_message}"
+        assert upload_result.bytes_sent > 0
+        assert upload_result.request_id_upload_url
+        assert upload_result.request_id_sync
+
+        # Reading the file proves it exists in the session and checks its content
+        read_result = session.file.read(remote_path)
+        assert read_result.success, f"read failed: {read_result.error_message}"
+        # Normalize line endings to handle \r\n vs \n differences
+        expected_content = test_content_bytes.decode("utf-8").strip()
+        actual_content = read_result.content.replace('\r\n', '\n').replace('\r', '\n').strip()
+        assert actual_content == expected_content
     finally:
         try:
             agb.delete(session, sync_context=False)
@@ -123,7 +135,7 @@ def test_file_transfer_upload_integration() -> None:
             pass
 
 
-def test_file_transfer_download_integration() -> None:
+def test_file_transfer_download_integration(tmp_path: Path) -> None:
     """
     Verify the full download workflow:
     1) Create a file inside the session filesystem
@@ -142,50 +154,42 @@ def test_file_transfer_download_integration() -> None:
     session = session_result.session
 
     try:
-        _sleep_for_session_ready()
-
-        context_path = session.file.transfer_path()
+        context_path = _wait_session_ready(session)
         if not context_path:
             pytest.fail("Failed to get file_transfer context_path (backend may not return internal context)")
 
-        remote_path = _safe_join_dir_file(context_path, "download_test.txt")
+        base = context_path.rstrip("/")
+        remote_path = _safe_join_dir_file(base, "download_test.txt")
         test_content = ("This is AGB FileTransfer download integration test content.\n" * 15)
 
         # Ensure directory exists, then write the remote file
-        mkdir_res = session.file.mkdir(f"{context_path.rstrip('/')}/")
+        mkdir_res = session.file.mkdir(f"{base}/")
         assert mkdir_res.success, f"create_directory failed: {mkdir_res.error_message}"
 
         write_res = session.file.write(remote_path, test_content, "overwrite")
         assert write_res.success, f"write failed: {write_res.error_message}"
 
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".txt") as f:
-            local_path = f.name
-
-        try:
-            download_result = session.file.download(
-                remote_path=remote_path,
-                local_path=local_path,
-                overwrite=True,
-                wait=True,
-                wait_timeout=300.0,
-                poll_interval=2.0,
-            )
-
-            assert download_result.success, f"Download failed: {download_result.error_message}"
-            assert download_result.bytes_received > 0
-            assert download_result.request_id_download_url
-            assert download_result.request_id_sync
-            assert download_result.local_path == local_path
-
-            with open(local_path, "r", encoding="utf-8") as rf:
-                downloaded = rf.read()
-            assert downloaded == test_content
-
-        finally:
-            try:
-                os.unlink(local_path)
-            except OSError:
-                pass
+        # pytest removes tmp_path, so the local file needs no cleanup
+        local_path = str(tmp_path / "download_test.txt")
+
+        download_result = session.file.download(
+            remote_path=remote_path,
+            local_path=local_path,
+            overwrite=True,
+            wait=True,
+            wait_timeout=300.0,
+            poll_interval=0.5,
+        )
+
+        assert download_result.success, f"Download failed: {download_result.error_message}"
+        assert download_result.bytes_received > 0
+        assert download_result.request_id_download_url
+        assert download_result.request_id_sync
+        assert download_result.local_path == local_path
+
+        # Line endings are normalized like the upload test's read check
+        expected_digest = hashlib.sha256(test_content.encode("utf-8")).digest()
+        assert _sha256_text_file(local_path) == expected_digest, "Downloaded content does not match"
 
     finally:
         try:
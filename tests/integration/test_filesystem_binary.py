@@ -1,52 +1,32 @@
 """Integration tests for binary file operations."""
 
+import hashlib
 import os
 import time
 import tempfile
+import uuid
 
 import pytest
 
-from agb import AGB
-from agb.session_params import CreateSessionParams
+from agb.logger import get_logger
 from agb.model.response import BinaryFileContentResult
 
+logger = get_logger(__name__)
+
+# Payload for test_read_binary_file: readable text, a marker, then every byte value
+_BINARY_TEXT = "Hello World! This is a test file for binary reading with base64 encoding support. 123456789"
+_BINARY_PAYLOAD = _BINARY_TEXT.encode("utf-8") + b"\n--- BINARY SECTION ---\n" + bytes(range(256))
+_BINARY_PAYLOAD_DIGEST = hashlib.sha256(_BINARY_PAYLOAD).digest()
+
 
 @pytest.fixture(scope="module")
-def agb_client():
-    """Create AGB client for testing."""
-    api_key = os.environ.get("AGB_API_KEY")
-    if not api_key:
-        pytest.skip("AGB_API_KEY environment variable not set")
-    return AGB(api_key=api_key)
-
-
-@pytest.fixture
-def test_session(agb_client):
-    """Create a session for binary file testing."""
-    print("Creating a new session for binary file testing...")
-    params = CreateSessionParams(image_id="agb-computer-use-ubuntu-2204")
-    result = agb_client.create(params)
-    if not result.success:
-        error_msg = getattr(result, 'error_message', 'Unknown error')
-        request_id = getattr(result, 'request_id', 'N/A')
-        print(f"Failed to create session:")
-        print(f"  Error message: {error_msg}")
-        print(f"  Request ID: {request_id}")
-        pytest.fail(f"Session creation failed: {error_msg} (Request ID: {request_id})")
-    assert result.session is not None, "Session object is None"
-    session = result.session
-    print(f"Session created successfully: {session.session_id}")
-    assert len(session.session_id) > 0 , "Session ID is None"
-    
-    yield session
-    
-    # Clean up
-    print("Cleaning up: Deleting the session...")
-    try:
-        agb_client.delete(session)
-        print(f"Session deleted: {session.session_id}")
-    except Exception as e:
-        print(f"Warning: Failed to delete session: {e}")
+def test_session(shared_session_for):
+    """
+    The run-wide computer-use session from conftest.py.
+
+    The tests work on distinct /tmp paths, so they can share it.
+    """
+    return shared_session_for("agb-computer-use-ubuntu-2204")
 
 
 def test_binary_file_creation(test_session):
@@ -54,14 +34,15 @@ def test_binary_file_creation(test_session):
     cmd = test_session.command
     fs = test_session.file
 
-    # Create binary file
+    # Create binary file; unique name since the session is shared
+    file_path = f"/tmp/binary_test_{uuid.uuid4().hex}"
     result = cmd.execute(
-        "dd if=/dev/zero of=/tmp/binary_test bs=1024 count=10"
+        f"dd if=/dev/zero of={file_path} bs=1024 count=10"
     )
     assert result.success
 
     # Check file info
-    info = fs.info("/tmp/binary_test")
+    info = fs.info(file_path)
     assert info.success
     size = int(info.file_info["size"])
     assert size > 0
@@ -98,40 +79,20 @@ def test_read_binary_file(test_session):
     
     # File path where user will manually upload the test file
     file_path = "/tmp/test_binary.dat"
-    print(f"\n📁 Creating a base64-compatible test file locally...")
+    logger.debug("📁 Creating a base64-compatible test file locally...")
     local_test_path = os.path.join(tempfile.gettempdir(), "test_upload_base64.dat")
     
-    import base64
-    
-    # Create test content that's designed to be base64-friendly
-    # Use a known pattern that will encode/decode cleanly
-    original_text = "Hello World! This is a test file for binary reading with base64 encoding support. 123456789"
-    
-    # Convert to bytes and create a predictable binary pattern
-    text_bytes = original_text.encode('utf-8')
-    
-    # Add some binary data that's base64-safe (using only bytes 0-255 in a controlled way)
-    binary_pattern = bytes(range(0, 256))  # Full byte range for comprehensive testing
-    
-    # Combine text and binary data
-    test_file_content = text_bytes + b'\n--- BINARY SECTION ---\n' + binary_pattern
-    
-    print(f"📊 Test content size: {len(test_file_content)} bytes")
-    print(f"📝 Content preview: {test_file_content[:50]}...")
-    
-    # Verify the content can be base64 encoded/decoded properly
-    try:
-        encoded = base64.b64encode(test_file_content)
-        decoded = base64.b64decode(encoded)
-        assert decoded == test_file_content, "Base64 round-trip failed"
-        print(f"✅ Base64 compatibility verified")
-    except Exception as e:
-        pytest.fail(f"Content is not base64 compatible: {e}")
+    # The payload is built at import time, before any session is created
+    original_text = _BINARY_TEXT
+    test_file_content = _BINARY_PAYLOAD
+    expected_digest = _BINARY_PAYLOAD_DIGEST
+    logger.debug("📊 Test content size: {} bytes", len(test_file_content))
+    logger.opt(lazy=True).debug("📝 Content preview: {}...", lambda: test_file_content[:50])
     
     with open(local_test_path, 'wb') as f:
         f.write(test_file_content)
     
-    print(f"✅ Test file created: {local_test_path} | Size: {len(test_file_content)} bytes")
+    logger.debug("✅ Test file created: {} | Size: {} bytes", local_test_path, len(test_file_content))
     
     # Check if local file exists before upload
     if not os.path.exists(local_test_path):
@@ -141,31 +102,31 @@ def test_read_binary_file(test_session):
         pytest.fail(f"Path is not a file: {local_test_path}")
     
     local_file_size = os.path.getsize(local_test_path)
-    print(f"📊 Local file size: {local_file_size} bytes")
+    logger.debug("📊 Local file size: {} bytes", local_file_size)
 
     remote_path = file_path
-    print(f"🎯 Remote path: {remote_path}")
+    logger.debug("🎯 Remote path: {}", remote_path)
     
-    print(f"\n📤 Uploading file from {local_test_path} to {remote_path}")
+    logger.debug("📤 Uploading file from {} to {}", local_test_path, remote_path)
     upload_result = fs.upload(local_test_path, remote_path, wait=True, wait_timeout=60)
     assert upload_result.success, f"Upload failed: {upload_result.error_message}"
     assert upload_result.bytes_sent > 0
     assert upload_result.request_id_upload_url
     assert upload_result.request_id_sync
     
-    print(f"✅ Upload successful: {upload_result.bytes_sent} bytes sent")
+    logger.debug("✅ Upload successful: {} bytes sent", upload_result.bytes_sent)
     
     # Verify file exists
-    print(f"\n🔍 Checking if file exists: {file_path}")
+    logger.debug("🔍 Checking if file exists: {}", file_path)
     info = fs.info(file_path)
     if not info.success:
         pytest.fail(f"File not found at {file_path}. Please ensure the file is uploaded correctly.")
     
     file_size = int(info.file_info["size"])
-    print(f"✅ File found, size: {file_size} bytes")
+    logger.debug("✅ File found, size: {} bytes", file_size)
     
     # Read binary file using format='bytes'
-    print(f"\n📖 Reading binary file: {file_path}")
+    logger.debug("📖 Reading binary file: {}", file_path)
     result = fs.read(file_path, format="bytes")
     assert result.success, f"Failed to read binary file: {result.error_message}"
     assert isinstance(result, BinaryFileContentResult), "Result should be BinaryFileContentResult"
@@ -176,14 +137,14 @@ def test_read_binary_file(test_session):
     # Check if content starts with our expected text
     content_str = result.content.decode('utf-8', errors='ignore')
     if original_text in content_str:
-        print(f"✅ Text content verified: Found expected text in file")
+        logger.debug("✅ Text content verified: Found expected text in file")
     else:
-        print(f"⚠️  Text content not found in decoded content")
+        logger.debug("⚠️  Text content not found in decoded content")
     
     # Verify the binary pattern is present
     binary_section_marker = b'\n--- BINARY SECTION ---\n'
     if binary_section_marker in result.content:
-        print(f"✅ Binary section marker found")
+        logger.debug("✅ Binary section marker found")
         # Find the binary pattern after the marker
         marker_pos = result.content.find(binary_section_marker)
         binary_start = marker_pos + len(binary_section_marker)
@@ -194,50 +155,30 @@ def test_read_binary_file(test_session):
             expected_pattern = bytes(range(0, 256))
             actual_pattern = binary_data[:256]
             if actual_pattern == expected_pattern:
-                print(f"✅ Binary pattern verified: 0-255 byte sequence found")
+                logger.debug("✅ Binary pattern verified: 0-255 byte sequence found")
             else:
-                print(f"⚠️  Binary pattern mismatch")
+                logger.debug("⚠️  Binary pattern mismatch")
         else:
-            print(f"⚠️  Binary data too short: {len(binary_data)} bytes")
+            logger.debug("⚠️  Binary data too short: {} bytes", len(binary_data))
     else:
-        print(f"⚠️  Binary section marker not found")
-    
-    print(f"✅ Successfully read binary file: {len(result.content)} bytes")
-    
-    # Save the read file to local file for verification
-    temp_dir = tempfile.gettempdir()
-    local_verification_path = os.path.join(temp_dir, "test_read_binary_verification.dat")
-    
-    print(f"\n💾 Saving read file to local file for verification...")
-    print(f"   Local path: {local_verification_path}")
-    
-    with open(local_verification_path, 'wb') as f:
-        f.write(result.content)
+        logger.debug("⚠️  Binary section marker not found")
     
-    # Verify local file was saved correctly
-    local_file_size = os.path.getsize(local_verification_path)
-    assert local_file_size == len(result.content), f"Local file size mismatch: {local_file_size} vs {len(result.content)}"
-    
-    print(f"✅ File saved successfully to: {local_verification_path}")
-    print(f"   File size: {local_file_size} bytes")
+    logger.debug("✅ Successfully read binary file: {} bytes", len(result.content))
     
     # Verify the content matches exactly what we originally created
-    with open(local_verification_path, 'rb') as f:
-        saved_content = f.read()
-    
-    if saved_content == test_file_content:
-        print(f"✅ Content integrity verified: Read content matches original")
-    else:
-        print(f"⚠️  Content mismatch detected")
-        print(f"   Original size: {len(test_file_content)}")
-        print(f"   Read size: {len(saved_content)}")
+    assert len(result.content) == len(test_file_content), (
+        f"Size mismatch: read {len(result.content)} vs original {len(test_file_content)}"
+    )
+    assert hashlib.sha256(result.content).digest() == expected_digest, (
+        "Content integrity check failed: read content does not match original"
+    )
+    logger.debug("✅ Content integrity verified: Read content matches original")
     
     # Verify optional fields
     if hasattr(result, 'size') and result.size is not None:
         assert result.size == file_size
     
-    print(f"\n✅ Binary file read test completed successfully!")
-    print(f"📁 Local verification file: {local_verification_path}")
+    logger.info("✅ Binary file read test completed successfully!")
 
 
 def test_read_binary_file_with_non_zero_content(test_session):
@@ -246,9 +187,11 @@ def test_read_binary_file_with_non_zero_content(test_session):
     fs = test_session.file
 
     # Create binary file with pattern (using printf to create specific bytes)
-    # Create a file with pattern: 0x00, 0x01, 0x02, ... repeating
+    # Create a file with pattern: 0x00, 0x01, 0x02, ... repeating. printf is a shell
+    # builtin, so no interpreter is started; file.write only takes text
+    octal_bytes = "".join(f"\\{i:03o}" for i in range(256))
     create_result = cmd.execute(
-        "python3 -c \"with open('/tmp/binary_pattern_test', 'wb') as f: f.write(bytes(range(256)) * 4)\""
+        f"for i in 1 2 3 4; do printf '{octal_bytes}'; done > /tmp/binary_pattern_test"
     )
     assert create_result.success
 
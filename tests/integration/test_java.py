@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Java code execution integration tests.
+
+Every test runs on the run-wide ``shared_session`` code-space session from conftest.py.
+"""
+
+import asyncio
+
+import pytest
+
+# Method bodies and the stdout each should produce. The server wraps the code in
+# a class and main method, so only the body is provided
+JAVA_SNIPPETS = {
+    "println": ('System.out.println("Java is supported");', "Java is supported"),
+    "statements": (
+        'String language = "Java";\nSystem.out.println(language + " is supported");',
+        "Java is supported",
+    ),
+}
+
+
+async def run_code_async(session, code, language="java"):
+    """Run ``session.code.run`` in a worker thread; the SDK call is blocking."""
+    return await asyncio.to_thread(session.code.run, code, language, timeout_s=30)
+
+
+@pytest.fixture(scope="module")
+def java_results(shared_session):
+    """Run every snippet in JAVA_SNIPPETS concurrently; results keyed by name."""
+
+    async def run_all():
+        return await asyncio.gather(
+            *(run_code_async(shared_session, code) for code, _ in JAVA_SNIPPETS.values())
+        )
+
+    return dict(zip(JAVA_SNIPPETS, asyncio.run(run_all())))
+
+
+@pytest.mark.parametrize("name", list(JAVA_SNIPPETS))
+def test_java_code_execution(java_results, name):
+    """Test that a Java method body runs and its stdout is captured."""
+    code_result = java_results[name]
+    _, expected = JAVA_SNIPPETS[name]
+
+    assert code_result.success, f"Java code execution failed: {code_result.error_message}"
+    stdout_content = "".join(code_result.logs.stdout or ())
+    assert expected in stdout_content, (
+        f"Expected {expected!r} in stdout, got {stdout_content!r} "
+        f"(stderr: {''.join(code_result.logs.stderr or ())!r})"
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(pytest.main([__file__, "-v", "-s"]))
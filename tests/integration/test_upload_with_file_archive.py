@@ -5,6 +5,7 @@ Tests different upload modes (FILE and ARCHIVE) based on context_sync.py UploadM
 Based on test_context_sync_integration.py format and external test content.
 """
 
+import itertools
 import os
 import time
 import unittest
@@ -16,6 +17,9 @@ from agb.context_manager import ContextStatusData
 from agb.session_params import CreateSessionParams
 from agb.context_sync import ContextSync, SyncPolicy, UploadPolicy, UploadMode
 
+# Suffixes for context names and paths: one clock read at import, then unique per call
+_PATH_COUNTER = itertools.count(int(time.time()))
+
 def generate_unique_id():
     """Generate unique ID for test isolation."""
     timestamp = int(time.time() * 1000000) + random.randint(0, 999)
@@ -378,7 +382,8 @@ class TestUploadModeIntegration(unittest.IsolatedAsyncioTestCase):
         print("\n=== Testing upload mode persistence with retry ===")
 
         # 1. Create a unique context name and get its ID
-        context_name = f"test-persistence-retry-py-{int(time.time())}"
+        suffix = next(_PATH_COUNTER)
+        context_name = f"test-persistence-retry-py-{suffix}"
         context_result = self.agb.context.get(context_name, create=True)
         self.assertTrue(context_result.success, "Error getting/creating context")
         self.assertIsNotNone(context_result.context, "Context should not be None")
@@ -388,8 +393,7 @@ class TestUploadModeIntegration(unittest.IsolatedAsyncioTestCase):
 
         try:
             # 2. Create a session with context sync, using a timestamped path under /home
-            timestamp = int(time.time())
-            sync_path = f"/home/test-path-py-{timestamp}"
+            sync_path = f"/home/test-path-py-{suffix}"
 
             # Use ARCHIVE upload mode for first session
             upload_policy = UploadPolicy(upload_mode=UploadMode.ARCHIVE)
@@ -0,0 +1,57 @@
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from agb.modules.browser import BrowserOption
+from agb.modules.browser.browser import Browser
+
+
+class TestBrowserResetForReinit(unittest.TestCase):
+    """Unit tests for Browser.reset_for_reinit."""
+
+    def setUp(self):
+        self.session = MagicMock()
+        self.session.get_api_key.return_value = "test-api-key"
+        self.session.get_session_id.return_value = "test-session-id"
+        self.browser = Browser(self.session)
+
+    def _mark_initialized(self):
+        self.browser._initialized = True
+        self.browser._option = BrowserOption()
+        self.browser._endpoint_url = "ws://example/cdp"
+        self.browser.endpoint_router_port = 9222
+
+    def test_reset_clears_initialization_state(self):
+        """Test that reset_for_reinit clears all local initialization state."""
+        self._mark_initialized()
+
+        self.browser.reset_for_reinit()
+
+        self.assertFalse(self.browser.is_initialized())
+        self.assertIsNone(self.browser.get_option())
+        self.assertIsNone(self.browser._endpoint_url)
+        self.assertIsNone(self.browser.endpoint_router_port)
+
+    def test_initialize_async_runs_again_after_reset(self):
+        """Test that initialize_async calls the backend again after a reset."""
+        self._mark_initialized()
+        response = MagicMock()
+        response.is_successful.return_value = True
+        response.get_port.return_value = 9333
+        client = MagicMock()
+        client.init_browser_async = AsyncMock(return_value=response)
+        self.session.get_client.return_value = client
+        option = BrowserOption()
+
+        self.browser.reset_for_reinit()
+        success = asyncio.run(self.browser.initialize_async(option))
+
+        self.assertTrue(success)
+        client.init_browser_async.assert_awaited_once()
+        self.assertTrue(self.browser.is_initialized())
+        self.assertIs(self.browser.get_option(), option)
+        self.assertEqual(self.browser.endpoint_router_port, 9333)
+
+
+if __name__ == "__main__":
+    unittest.main()
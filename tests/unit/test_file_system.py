@@ -725,6 +725,41 @@ class TestFileChangeResult(unittest.TestCase):
         self.assertEqual(deleted[0], "/tmp/file1.txt")
 
 
+class TestWatchDir(unittest.TestCase):
+    """Test FileSystem.watch_dir monitoring thread."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.session = DummySession()
+        self.file = FileSystem(self.session)
+
+    def test_watch_dir_exposes_interval(self):
+        """Test watch_dir stores the polling interval on the thread."""
+        monitor_thread = self.file.watch_dir("/tmp", callback=MagicMock(), interval=0.25)
+
+        self.assertEqual(monitor_thread.interval, 0.25)
+        self.assertFalse(monitor_thread.stop_event.is_set())
+
+    def test_watch_dir_rereads_interval_between_polls(self):
+        """Test watch_dir waits with the interval currently set on the thread."""
+        stop_event = MagicMock()
+        stop_event.is_set.side_effect = [False, False, True]
+        self.file._get_file_change = MagicMock(
+            return_value=FileChangeResult(request_id="req-watch", success=True, events=[])
+        )
+
+        def callback(events):
+            monitor_thread.interval = min(monitor_thread.interval * 2, 2.0)
+
+        monitor_thread = self.file.watch_dir(
+            "/tmp", callback=callback, interval=0.25, stop_event=stop_event
+        )
+        monitor_thread.run()
+
+        waits = [call.args[0] for call in stop_event.wait.call_args_list]
+        self.assertEqual(waits, [0.5, 1.0])
+
+
 if __name__ == "__main__":
     unittest.main()
 
@@ -110,3 +110,35 @@ async def test_make_request_async_handles_exception(monkeypatch):
     assert res["success"] is False
     assert "boom" in res["error"]
 
+
+@pytest.mark.asyncio
+async def test_make_request_async_reuses_ssl_context(monkeypatch):
+    c = HTTPClient(api_key="Bearer x", cfg=_Cfg())
+
+    import agb.api.http_client as http_client_mod
+
+    contexts = []
+
+    class _FakeConnector:
+        def __init__(self, ssl=None):
+            contexts.append(ssl)
+
+        async def __aenter__(self):
+            return self
+
+        async def __aexit__(self, exc_type, exc, tb):
+            return False
+
+    fake_session = _FakeAiohttpSession(
+        {"GET": _FakeAiohttpResponse(status=200, json_obj={"requestId": "rid"})}
+    )
+    monkeypatch.setattr(http_client_mod.aiohttp, "TCPConnector", _FakeConnector)
+    monkeypatch.setattr(http_client_mod.aiohttp, "ClientTimeout", lambda total=None: object())
+    monkeypatch.setattr(http_client_mod.aiohttp, "ClientSession", lambda **kwargs: fake_session)
+
+    http_client_mod._async_ssl_context()
+    await c._make_request_async("GET", "/mcp/getSession")
+    await c._make_request_async("GET", "/mcp/getSession")
+
+    assert len(contexts) == 2
+    assert contexts[0] is contexts[1] is http_client_mod._async_ssl_context()
@@ -54,6 +54,28 @@ def _new_client():
     return c
 
 
+def test_http_clients_share_connection_pool_across_close():
+    first = HTTPClient(api_key="Bearer x", cfg=_Cfg())
+    second = HTTPClient(api_key="Bearer y", cfg=_Cfg())
+    adapter = first.session.get_adapter("https://example.com")
+    assert second.session.get_adapter("https://example.com") is adapter
+    pool = adapter.poolmanager.connection_from_url("https://example.com")
+
+    first.close()
+    # Closing one client must leave the pool usable for the other clients
+    assert "https://" not in first.session.adapters
+    assert second.session.get_adapter("https://example.com") is adapter
+    assert adapter.poolmanager.connection_from_url("https://example.com") is pool
+    third = HTTPClient(api_key="Bearer z", cfg=_Cfg())
+    assert third.session.get_adapter("https://example.com") is adapter
+
+
+def test_shared_connection_pool_does_not_retry_requests():
+    adapter = HTTPClient(api_key="Bearer x", cfg=_Cfg()).session.get_adapter("https://example.com")
+    assert adapter.max_retries.total == 0
+    assert adapter.max_retries.read is False
+
+
 def test_http_client_requires_config_when_no_default():
     with pytest.raises(ValueError, match="No configuration provided"):
         HTTPClient(api_key="x", cfg=None)